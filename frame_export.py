@@ -0,0 +1,239 @@
+"""
+Headless frame export for cooperative Tetris highlights and bug reports
+"""
+import os
+import queue
+import random
+import threading
+import time
+
+import pygame
+
+# Stops an encoder worker
+_STOP = object()
+
+
+class ScriptedClock:
+    """Game clock that advances a fixed step per frame instead of following wall time"""
+
+    def __init__(self, fps=60):
+        """Start the clock at the current wall time"""
+        self.now_ms = time.time() * 1000
+        self.frame_ms = 1000 / fps
+
+    def now(self):
+        """Get the current scripted time in milliseconds"""
+        return self.now_ms
+
+    def tick(self):
+        """Advance the clock by one frame"""
+        self.now_ms += self.frame_ms
+
+
+class FrameExporter:
+    """Encodes captured frames on a pool of background threads"""
+
+    def __init__(self, output_path, fmt='png', workers=2, max_pending=32,
+                 capture_every=1, fps=60, max_gif_frames=600):
+        """Start the encoder pool
+
+        output_path is a directory for a PNG sequence or a file for a GIF.
+        At most max_pending frames wait for encoding; further frames are
+        dropped instead of queued, so memory stays bounded.
+
+        A GIF has to be assembled in memory, so at most max_gif_frames
+        frames are kept; later frames are dropped.
+        """
+        if fmt not in ('png', 'gif'):
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if fmt == 'gif':
+            try:
+                from PIL import Image
+            except ImportError:
+                raise RuntimeError("GIF export requires Pillow; install the 'export' extra "
+                                   "(pip install 'pillow>=10')")
+            self._image_module = Image
+            self._gif_frames = {}
+        else:
+            os.makedirs(output_path, exist_ok=True)
+
+        self.output_path = output_path
+        self.fmt = fmt
+        self.capture_every = max(1, capture_every)
+        self.fps = fps
+        self.max_gif_frames = max_gif_frames
+        self.frames_seen = 0
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_encoded = 0
+        self.frames_failed = 0
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+        self._end_time = None
+        self._workers = [threading.Thread(target=self._work, daemon=True)
+                         for _ in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def capture(self, surface):
+        """Hand a frame off for encoding without blocking the caller
+
+        Returns True if the frame was queued, False if it was throttled or dropped.
+        """
+        index = self.frames_seen
+        self.frames_seen += 1
+        if index % self.capture_every:
+            return False
+        if self.fmt == 'gif' and self.frames_submitted >= self.max_gif_frames:
+            self.frames_dropped += 1
+            return False
+
+        # Frames are indexed by when they were seen, so drops leave visible gaps
+        frame = (index, surface.get_size(), pygame.image.tobytes(surface, 'RGB'))
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+        self.frames_submitted += 1
+        return True
+
+    def _work(self):
+        """Encode frames from the queue until told to stop"""
+        while True:
+            frame = self._queue.get()
+            if frame is _STOP:
+                return
+            try:
+                self._encode(*frame)
+            except Exception as e:
+                print(f"Frame export failed for frame {frame[0]}: {e}")
+                with self._lock:
+                    self.frames_failed += 1
+                continue
+            with self._lock:
+                self.frames_encoded += 1
+
+    def _encode(self, index, size, pixels):
+        """Encode one frame"""
+        if self.fmt == 'png':
+            path = os.path.join(self.output_path, f"frame_{index:06d}.png")
+            pygame.image.save(pygame.image.frombytes(pixels, size, 'RGB'), path)
+        else:
+            image = self._image_module.frombytes('RGB', size, pixels).quantize()
+            with self._lock:
+                self._gif_frames[index] = image
+
+    def close(self):
+        """Wait for pending frames and finish the export"""
+        # Never block on a full queue if the workers are gone
+        stops_sent = 0
+        while stops_sent < len(self._workers) and any(w.is_alive() for w in self._workers):
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                stops_sent += 1
+            except queue.Full:
+                pass
+        for worker in self._workers:
+            worker.join()
+
+        if self.fmt == 'gif' and self._gif_frames:
+            indexes = sorted(self._gif_frames)
+            frames = [self._gif_frames[i] for i in indexes]
+            # Each frame lasts until the next one, so dropped frames keep real timing
+            frame_ms = 1000 / self.fps
+            durations = [int((after - before) * frame_ms)
+                         for before, after in zip(indexes, indexes[1:])]
+            durations.append(int(self.capture_every * frame_ms))
+            frames[0].save(self.output_path, save_all=True, append_images=frames[1:],
+                           duration=durations, loop=0)
+            self._gif_frames = {}
+
+        self._end_time = time.perf_counter()
+
+    def export_fps(self):
+        """Get the encoding throughput in frames per second"""
+        end_time = self._end_time or time.perf_counter()
+        elapsed = end_time - self._start_time
+        if elapsed <= 0:
+            return 0.0
+        return self.frames_encoded / elapsed
+
+
+def random_script(seed=None):
+    """Build a script that presses random controls for the current player"""
+    rng = random.Random(seed)
+    controls = ['a', 'd', 's', 'w', 'q', 'e', 'j', 'l', 'k', 'i', 'u', 'o']
+
+    def script(frame_index):
+        if frame_index % 10:
+            return ()
+        return (rng.choice(controls),)
+
+    return script
+
+
+def export_scripted_game(script, output_path, fmt='png', max_frames=600, fps=60,
+                         workers=2, max_pending=32, capture_every=1,
+                         max_gif_frames=600):
+    """Run a scripted game offscreen and export its frames
+
+    script is called with the frame index and returns the control keys
+    (e.g. 'a', 'w') held during that frame. Returns the finished exporter.
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    from tetris_game import CooperativeTetris
+
+    game = CooperativeTetris()
+    clock = ScriptedClock(fps)
+    game.current_time_ms = clock.now
+
+    exporter = FrameExporter(output_path, fmt, workers, max_pending, capture_every, fps,
+                             max_gif_frames)
+    try:
+        for frame_index in range(max_frames):
+            keys_pressed = dict.fromkeys(script(frame_index), True)
+            game.update_game_logic(keys_pressed)
+            game.draw_frame()
+            exporter.capture(game.screen)
+            clock.tick()
+            if game.game_over:
+                game.draw_frame()
+                exporter.capture(game.screen)
+                break
+    finally:
+        exporter.close()
+        pygame.quit()
+
+    return exporter
+
+
+def main():
+    """Export a randomly played game from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export cooperative Tetris frames headlessly")
+    parser.add_argument('output', help="directory for PNG frames or .gif file")
+    parser.add_argument('--format', choices=['png', 'gif'], default='png')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-pending', type=int, default=32)
+    parser.add_argument('--capture-every', type=int, default=1)
+    parser.add_argument('--max-gif-frames', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    exporter = export_scripted_game(random_script(args.seed), args.output, args.format,
+                                    args.frames, args.fps, args.workers,
+                                    args.max_pending, args.capture_every,
+                                    args.max_gif_frames)
+    print(f"Encoded {exporter.frames_encoded} frames "
+          f"({exporter.frames_dropped} dropped, {exporter.frames_failed} failed) "
+          f"at {exporter.export_fps():.1f} fps")
+
+
+if __name__ == "__main__":
+    main()
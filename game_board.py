@@ -14,13 +14,24 @@ class GameBoard:
     
     def is_valid_position(self, piece):
         """Check if a piece can be placed at its current position"""
-        cells = piece.get_cells()
-        for x, y in cells:
+        return self.can_place(piece)
+    
+    def can_place(self, piece, dx=0, dy=0, rotation=None):
+        """Check if a piece would fit after an offset and/or rotation
+        
+        The piece itself is not modified and no temporary piece is built.
+        """
+        base_x = piece.x + dx
+        base_y = piece.y + dy
+        grid = self.grid
+        for col, row in piece.cell_offsets(rotation):
+            x = base_x + col
+            y = base_y + row
             # Check bounds
             if x < 0 or x >= BOARD_WIDTH or y >= BOARD_HEIGHT:
                 return False
             # Check collision with existing blocks (only if y >= 0)
-            if y >= 0 and self.grid[y][x] != BLACK:
+            if y >= 0 and grid[y][x] != BLACK:
                 return False
         return True
     
@@ -58,11 +69,10 @@ class GameBoard:
     
     def get_drop_position(self, piece):
         """Get the Y position where the piece would land if dropped"""
-        test_piece = piece.copy()
-        while self.is_valid_position(test_piece):
-            test_piece.move(0, 1)
-        test_piece.move(0, -1)
-        return test_piece.y
+        dy = 0
+        while self.can_place(piece, 0, dy):
+            dy += 1
+        return piece.y + dy - 1
     
     def get_height(self):
         """Get the height of the highest block on the board"""
@@ -0,0 +1,240 @@
+"""
+Input-to-display latency measurement for cooperative Tetris
+
+Synthetic key events are posted with pygame.event.post under the dummy
+video driver. Each event is timestamped when posted and again when the
+first frame showing its effect is handed to pygame.display.flip.
+"""
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+
+import pygame
+
+# Control used for each measured action
+ACTIONS = {
+    'move': 'left',
+    'rotate': 'rotate',
+    'hard_drop': 'drop',
+    'pass': 'pass',
+}
+
+
+def _burn_cpu(stop):
+    """Keep one core busy until told to stop"""
+    while not stop.is_set():
+        pass
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class LatencyProbe:
+    """One injected key event waiting to appear on screen"""
+
+    def __init__(self, action, key, before):
+        """Remember what the game looked like before the event"""
+        self.action = action
+        self.key = key
+        self.before = before
+        self.posted_at = None
+        self.latency = None
+        self.done = threading.Event()
+
+
+class LatencyHarness:
+    """Drives a game with synthetic input and measures latency per action"""
+
+    def __init__(self, fps=60, samples=200, load_workers=0, timeout=1.0, seed=None):
+        """Configure the run"""
+        self.fps = fps
+        self.samples = samples
+        self.load_workers = load_workers
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.latencies = {action: [] for action in ACTIONS}
+        self.missed = {action: 0 for action in ACTIONS}
+
+        self.game = None
+        self._probe = None
+        self._pending_setup = None
+        self._prepared = None
+        self._setup_done = threading.Event()
+        self._real_flip = pygame.display.flip
+
+    def _snapshot(self):
+        """Capture the visible state that an input can change"""
+        player = self.game.current_player
+        piece = player.current_piece
+        if piece is None:
+            return (player.id, None)
+        return (player.id, id(piece), piece.x, piece.y, piece.rotation)
+
+    def _prepare(self, action):
+        """Put the game in a state where the action is guaranteed to show"""
+        game = self.game
+        if game.game_over or game.board.get_height() > 8:
+            game.restart_game()
+        game.paused = False
+        game.lock_timer = 0
+
+        player = game.current_player
+        if player.current_piece is None:
+            game.spawn_piece(player)
+        player.current_piece.x = 4
+        player.current_piece.y = 2
+        player.last_move_time = 0
+        player.last_rotation_time = 0
+
+        # Passing only works when the partner has no piece
+        if action == 'pass':
+            game.other_player.current_piece = None
+
+    def _flip(self):
+        """display.flip replacement that detects when a probe becomes visible"""
+        now = time.perf_counter()
+
+        if self._pending_setup is not None:
+            action = self._pending_setup
+            self._prepare(action)
+            # Press the key of whichever player currently has the turn
+            control = self.game.current_player.controls[ACTIONS[action]]
+            self._prepared = (pygame.key.key_code(control), self._snapshot())
+            self._pending_setup = None
+            self._setup_done.set()
+
+        probe = self._probe
+        if probe is not None and probe.posted_at is not None and not probe.done.is_set():
+            if self._snapshot() != probe.before:
+                probe.latency = now - probe.posted_at
+                # Release the key before the next frame so it does not repeat
+                pygame.event.post(pygame.event.Event(pygame.KEYUP, key=probe.key))
+                probe.done.set()
+
+        self._real_flip()
+
+    def _inject(self):
+        """Post one key event per sample at a random point within a frame"""
+        frame_time = 1.0 / self.fps
+        actions = list(ACTIONS)
+        # Let the first frames render before measuring
+        time.sleep(frame_time * 5)
+
+        for _ in range(self.samples):
+            for action in actions:
+                self._setup_done.clear()
+                self._pending_setup = action
+                if not self._setup_done.wait(self.timeout):
+                    self.missed[action] += 1
+                    continue
+
+                # Key and snapshot were taken on the game thread in _flip
+                key, before = self._prepared
+                probe = LatencyProbe(action, key, before)
+                self._probe = probe
+                time.sleep(self.rng.uniform(0, frame_time))
+
+                probe.posted_at = time.perf_counter()
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+                if probe.done.wait(self.timeout):
+                    self.latencies[action].append(probe.latency)
+                else:
+                    self.missed[action] += 1
+                    pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key))
+                self._probe = None
+
+                # Give the key release a couple of frames to be processed
+                time.sleep(frame_time * 2)
+
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def run(self):
+        """Play the game with synthetic input and return the report"""
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from tetris_game import CooperativeTetris
+
+        stop_load = multiprocessing.Event()
+        load = [multiprocessing.Process(target=_burn_cpu, args=(stop_load,), daemon=True)
+                for _ in range(self.load_workers)]
+        for process in load:
+            process.start()
+
+        self.game = CooperativeTetris()
+        self.game.fps = self.fps
+        self.game.track_posted_keys = True
+        # Only injected input may change the piece
+        self.game.turn_duration = float('inf')
+        self.game.fall_time = float('inf')
+        self.game.LOCK_DELAY = float('inf')
+
+        injector = threading.Thread(target=self._inject, daemon=True)
+        pygame.display.flip = self._flip
+        try:
+            injector.start()
+            self.game.run()
+            injector.join()
+        finally:
+            pygame.display.flip = self._real_flip
+            stop_load.set()
+            for process in load:
+                process.join()
+
+        return self.report()
+
+    def report(self):
+        """Summarize latencies per action in milliseconds"""
+        summary = {}
+        for action, values in self.latencies.items():
+            ordered = sorted(values)
+            p50 = _percentile(ordered, 0.50)
+            p99 = _percentile(ordered, 0.99)
+            summary[action] = {
+                'samples': len(ordered),
+                'missed': self.missed[action],
+                'p50_ms': p50 * 1000 if p50 is not None else None,
+                'p99_ms': p99 * 1000 if p99 is not None else None,
+                'max_ms': ordered[-1] * 1000 if ordered else None,
+            }
+        return summary
+
+
+def main():
+    """Measure latency from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure cooperative Tetris input latency")
+    parser.add_argument('--fps', type=int, nargs='+', default=[60])
+    parser.add_argument('--samples', type=int, default=200,
+                        help="samples per action; p99 equals the maximum below 100")
+    parser.add_argument('--load', type=int, nargs='+', default=[0],
+                        help="number of busy processes to run alongside the game")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    for fps in args.fps:
+        for load_workers in args.load:
+            harness = LatencyHarness(fps, args.samples, load_workers, seed=args.seed)
+            summary = harness.run()
+            print(f"fps={fps} load={load_workers}")
+            for action, stats in summary.items():
+                if stats['samples']:
+                    # Below 100 samples the nearest-rank p99 is the maximum
+                    p99_note = " (p99=max)" if stats['samples'] < 100 else ""
+                    print(f"  {action:<10} p50={stats['p50_ms']:6.2f}ms "
+                          f"p99={stats['p99_ms']:6.2f}ms max={stats['max_ms']:6.2f}ms "
+                          f"n={stats['samples']} missed={stats['missed']}{p99_note}")
+                else:
+                    print(f"  {action:<10} no samples (missed={stats['missed']})")
+
+
+if __name__ == "__main__":
+    main()
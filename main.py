@@ -1,13 +1,24 @@
 """
 Main entry point for the cooperative Tetris game
 """
-
+import os
+import sqlite3
 from tetris_game import CooperativeTetris
+from telemetry import Telemetry
+from session_store import SessionStore
 
 def main():
     """Start the cooperative Tetris game"""
     try:
-        game = CooperativeTetris()
+        # Opt in to gameplay telemetry by pointing this at a directory
+        telemetry_dir = os.environ.get('TETRIS_TELEMETRY_DIR')
+        telemetry = Telemetry(telemetry_dir) if telemetry_dir else None
+        try:
+            session_store = SessionStore(os.environ.get('TETRIS_SESSION_DB', 'tetris_sessions.db'))
+        except sqlite3.Error as e:
+            print(f"Leaderboard unavailable: {e}")
+            session_store = None
+        game = CooperativeTetris(telemetry, session_store)
         game.run()
     except Exception as e:
         print(f"Error starting game: {e}")
@@ -56,9 +56,7 @@ class Player:
         
         # Check for rotation
         if keys_pressed.get(self.controls['rotate'], False) and self.can_rotate(current_time):
-            test_piece = self.current_piece.copy()
-            test_piece.rotate()
-            if game_board.is_valid_position(test_piece):
+            if game_board.can_place(self.current_piece, rotation=(self.current_piece.rotation + 1) % 4):
                 self.current_piece.rotate()
                 action = 'rotate'
                 self.last_rotation_time = current_time
@@ -66,25 +64,19 @@ class Player:
         # Check for movement
         if self.can_move(current_time):
             if keys_pressed.get(self.controls['left'], False):
-                test_piece = self.current_piece.copy()
-                test_piece.move(-1, 0)
-                if game_board.is_valid_position(test_piece):
+                if game_board.can_place(self.current_piece, -1, 0):
                     self.current_piece.move(-1, 0)
                     action = 'move_left'
                     self.last_move_time = current_time
             
             elif keys_pressed.get(self.controls['right'], False):
-                test_piece = self.current_piece.copy()
-                test_piece.move(1, 0)
-                if game_board.is_valid_position(test_piece):
+                if game_board.can_place(self.current_piece, 1, 0):
                     self.current_piece.move(1, 0)
                     action = 'move_right'
                     self.last_move_time = current_time
             
             elif keys_pressed.get(self.controls['down'], False):
-                test_piece = self.current_piece.copy()
-                test_piece.move(0, 1)
-                if game_board.is_valid_position(test_piece):
+                if game_board.can_place(self.current_piece, 0, 1):
                     self.current_piece.move(0, 1)
                     action = 'move_down'
                     self.last_move_time = current_time
@@ -0,0 +1,161 @@
+"""
+Persistent leaderboard and session store for cooperative Tetris
+"""
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    team TEXT NOT NULL,
+    shared_score INTEGER NOT NULL,
+    player1_score INTEGER NOT NULL,
+    player1_pieces INTEGER NOT NULL,
+    player1_lines INTEGER NOT NULL,
+    player2_score INTEGER NOT NULL,
+    player2_pieces INTEGER NOT NULL,
+    player2_lines INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_score ON sessions (shared_score DESC);
+CREATE INDEX IF NOT EXISTS idx_sessions_day_score ON sessions (day, shared_score DESC);
+CREATE INDEX IF NOT EXISTS idx_sessions_team_score ON sessions (team, shared_score DESC);
+"""
+
+INSERT_SESSION = """
+INSERT INTO sessions (ended_at, day, team, shared_score,
+                      player1_score, player1_pieces, player1_lines,
+                      player2_score, player2_pieces, player2_lines)
+VALUES (:ended_at, :day, :team, :shared_score,
+        :player1_score, :player1_pieces, :player1_lines,
+        :player2_score, :player2_pieces, :player2_lines)
+"""
+
+# Stops the writer thread
+_STOP = object()
+
+
+def _connect(path):
+    """Open a connection in WAL mode"""
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class SessionStore:
+    """SQLite-backed session history written from a background thread"""
+
+    def __init__(self, path, team='local', top_count=5):
+        """Open the database and start the writer thread"""
+        self.path = path
+        self.team = team
+        self.top_count = top_count
+        self._top_scores = []
+        self._error = None
+        self._queue = queue.Queue()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+
+    def record_session(self, shared_score, player1, player2):
+        """Queue a finished session; never blocks on the database
+
+        Raises RuntimeError if the writer thread has stopped.
+        """
+        if not self._thread.is_alive():
+            reason = self._error or "store is closed"
+            raise RuntimeError(f"Session store writer is not running: {reason}")
+        ended_at = time.time()
+        self._queue.put({
+            'ended_at': ended_at,
+            'day': time.strftime('%Y-%m-%d', time.localtime(ended_at)),
+            'team': self.team,
+            'shared_score': shared_score,
+            'player1_score': player1.score,
+            'player1_pieces': player1.pieces_placed,
+            'player1_lines': player1.lines_contributed,
+            'player2_score': player2.score,
+            'player2_pieces': player2.pieces_placed,
+            'player2_lines': player2.lines_contributed,
+        })
+
+    def top_scores(self):
+        """Get the cached best shared scores, highest first"""
+        return self._top_scores
+
+    def _run(self):
+        """Create the schema, then insert queued sessions until stopped"""
+        connection = None
+        try:
+            connection = _connect(self.path)
+            connection.executescript(SCHEMA)
+            self._top_scores = self._query_top(connection, self.top_count)
+        except sqlite3.Error as e:
+            # Reported to the constructor, which re-raises it
+            self._error = e
+            if connection:
+                connection.close()
+            return
+        finally:
+            self._ready.set()
+
+        try:
+            while True:
+                session = self._queue.get()
+                if session is _STOP:
+                    return
+                try:
+                    with connection:
+                        connection.execute(INSERT_SESSION, session)
+                except sqlite3.Error as e:
+                    self._error = e
+                    print(f"Failed to record session: {e}")
+                    continue
+                self._update_top_scores(session['shared_score'])
+        finally:
+            connection.close()
+
+    def _update_top_scores(self, shared_score):
+        """Merge a new score into the cache without querying"""
+        scores = sorted(self._top_scores + [shared_score], reverse=True)
+        # Swap in a new list so the game thread never sees a partial update
+        self._top_scores = scores[:self.top_count]
+
+    @staticmethod
+    def _query_top(connection, limit, day=None, team=None):
+        """Get the best shared scores, optionally for one day or team"""
+        sql = "SELECT shared_score FROM sessions"
+        conditions = []
+        params = []
+        if day is not None:
+            conditions.append("day = ?")
+            params.append(day)
+        if team is not None:
+            conditions.append("team = ?")
+            params.append(team)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY shared_score DESC LIMIT ?"
+        params.append(limit)
+        return [row[0] for row in connection.execute(sql, params)]
+
+    def query_top(self, limit=10, day=None, team=None):
+        """Query the best shared scores directly; not for use in the frame loop"""
+        connection = _connect(self.path)
+        try:
+            return self._query_top(connection, limit, day, team)
+        finally:
+            connection.close()
+
+    def close(self):
+        """Finish pending writes and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+        self._thread.join()
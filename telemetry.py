@@ -0,0 +1,131 @@
+"""
+Gameplay telemetry for cooperative Tetris
+
+The game thread only appends events to an in-memory ring buffer; a
+background thread drains it in batches to rotating JSONL files.
+"""
+import json
+import os
+import threading
+import uuid
+
+
+class RingBuffer:
+    """Fixed-size single-producer, single-consumer event buffer
+
+    The producer only advances write_index and the consumer only advances
+    read_index, so neither side takes a lock. When the buffer is full new
+    events are dropped and counted rather than blocking the producer.
+    """
+
+    def __init__(self, capacity=4096):
+        """Allocate all slots up front"""
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.write_index = 0
+        self.read_index = 0
+        self.dropped = 0
+
+    def append(self, item):
+        """Add an item; returns False if the buffer is full"""
+        if self.write_index - self.read_index >= self.capacity:
+            self.dropped += 1
+            return False
+        self.slots[self.write_index % self.capacity] = item
+        self.write_index += 1
+        return True
+
+    def drain(self, max_items):
+        """Remove and return up to max_items of the oldest items"""
+        items = []
+        end = min(self.write_index, self.read_index + max_items)
+        for index in range(self.read_index, end):
+            slot = index % self.capacity
+            items.append(self.slots[slot])
+            self.slots[slot] = None
+        self.read_index = end
+        return items
+
+
+class Telemetry:
+    """Collects game events and writes them from a background thread"""
+
+    def __init__(self, directory, capacity=4096, batch_size=256,
+                 flush_interval=1.0, max_file_bytes=5 * 1024 * 1024):
+        """Start the writer thread for a new session"""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        # Names this process's files; each game gets its own session id
+        self.run_id = uuid.uuid4().hex
+        self.session_id = None
+        self.new_session()
+        self.buffer = RingBuffer(capacity)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+
+        self._file = None
+        self._file_index = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def new_session(self):
+        """Start a new session id for the next game"""
+        self.session_id = uuid.uuid4().hex
+
+    def emit(self, event_type, timestamp_ms, **fields):
+        """Record an event; safe to call every frame from the game thread"""
+        self.buffer.append((self.session_id, timestamp_ms, event_type, fields))
+
+    def _run(self):
+        """Flush batches until stopped, then flush whatever is left"""
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+        self._flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _flush(self):
+        """Write all buffered events in batches"""
+        while True:
+            batch = self.buffer.drain(self.batch_size)
+            if not batch:
+                return
+            lines = []
+            for session_id, timestamp_ms, event_type, fields in batch:
+                record = {'ts_ms': timestamp_ms, 'session': session_id, 'event': event_type}
+                record.update(fields)
+                lines.append(json.dumps(record))
+            self._write(''.join(line + '\n' for line in lines))
+
+    def _write(self, data):
+        """Append to the current file, rotating it when it grows too large"""
+        if self._file and self._file.tell() >= self.max_file_bytes:
+            self._file.close()
+            self._file = None
+            self._file_index += 1
+        if self._file is None:
+            name = f"telemetry-{self.run_id}-{self._file_index:04d}.jsonl"
+            self._file = open(os.path.join(self.directory, name), 'a', encoding='utf-8')
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self):
+        """Stop the writer thread after flushing pending events"""
+        self._stop.set()
+        self._thread.join()
+
+
+class NullTelemetry:
+    """Telemetry sink that discards all events"""
+
+    def new_session(self):
+        """No sessions to track"""
+
+    def emit(self, event_type, timestamp_ms, **fields):
+        """Ignore the event"""
+
+    def close(self):
+        """Nothing to flush"""
@@ -6,15 +6,17 @@ import time
 from game_board import GameBoard
 from player import Player
 from tetris_pieces import TetrisPiece
+from tile_atlas import TileAtlas, TileBatch
+from telemetry import NullTelemetry
 from constants import *
 
 class CooperativeTetris:
     """Main game class for cooperative Tetris"""
     
-    def __init__(self):
+    def __init__(self, telemetry=None, session_store=None):
         """Initialize the game"""
         import os
-        os.environ['SDL_VIDEODRIVER'] = 'x11'
+        os.environ.setdefault('SDL_VIDEODRIVER', 'x11')
         
         pygame.init()
         pygame.display.init()
@@ -28,6 +30,18 @@ class CooperativeTetris:
         
         pygame.display.set_caption("Cooperative Tetris")
         self.clock = pygame.time.Clock()
+        self.fps = 60
+        
+        # Posted KEYDOWN/KEYUP events do not update pygame.key.get_pressed(),
+        # so test harnesses can opt in to tracking held keys from events
+        self.track_posted_keys = False
+        self.held_keys = set()
+        
+        # Gameplay event stream; never touches the disk from this thread
+        self.telemetry = telemetry or NullTelemetry()
+        
+        # Finished sessions are recorded here before restart discards them
+        self.session_store = session_store
         
         # Game state
         self.board = GameBoard()
@@ -43,7 +57,7 @@ class CooperativeTetris:
         self.turn_duration = 10000  # 10 seconds per turn
         
         # Game timing
-        self.last_fall_time = time.time() * 1000
+        self.last_fall_time = self.current_time_ms()
         self.fall_time = FALL_TIME
         self.lock_timer = 0
         self.LOCK_DELAY = 1000  # 1 second lock delay
@@ -57,22 +71,41 @@ class CooperativeTetris:
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
+        # Pre-rendered cell tiles, drawn once per frame in a single batch
+        self.cell_size = CELL_SIZE
+        self.tiles = TileAtlas(self.cell_size)
+        self.tile_batch = TileBatch(self.tiles, BOARD_WIDTH * BOARD_HEIGHT + 8)
+        
+        self.games_started = 1
+        self.record_event('session_start', game=self.games_started)
+        
         # Initialize first pieces
-        self.player1.spawn_new_piece()
-        self.player2.spawn_new_piece()
+        self.spawn_piece(self.player1)
+        self.spawn_piece(self.player2)
         
         # Start with player 1
-        self.switch_turn()
+        self.switch_turn('start')
         
+    def current_time_ms(self):
+        """Get the game clock in milliseconds"""
+        return time.time() * 1000
+    
     def is_on_ground(self, piece):
         """Check if the piece is on the ground (cannot move down)"""
         if not piece:
             return False
-        test_piece = piece.copy()
-        test_piece.move(0, 1)
-        return not self.board.is_valid_position(test_piece)
+        return not self.board.can_place(piece, 0, 1)
     
-    def switch_turn(self):
+    def record_event(self, event_type, **fields):
+        """Send a telemetry event stamped with the game clock"""
+        self.telemetry.emit(event_type, self.current_time_ms(), **fields)
+    
+    def spawn_piece(self, player):
+        """Give a player their next piece"""
+        player.spawn_new_piece()
+        self.record_event('piece_spawn', player=player.id, piece=player.current_piece.type)
+    
+    def switch_turn(self, reason='placement'):
         """Switch to the other player's turn"""
         if self.current_player == self.player1:
             self.current_player = self.player2
@@ -81,20 +114,19 @@ class CooperativeTetris:
             self.current_player = self.player1
             self.other_player = self.player2
         
-        self.turn_switch_timer = time.time() * 1000
+        self.turn_switch_timer = self.current_time_ms()
         self.lock_timer = 0  # Reset lock timer on turn switch
         
+        self.record_event('turn_switch', player=self.current_player.id, reason=reason)
+        
         # If current player doesn't have a piece, spawn one
         if not self.current_player.current_piece:
-            self.current_player.spawn_new_piece()
+            self.spawn_piece(self.current_player)
     
     def handle_events(self):
         """Handle pygame events"""
         keys_pressed = {}
         
-        # Get currently pressed keys
-        keys = pygame.key.get_pressed()
-        
         # Map pygame keys to our control system
         key_map = {
             pygame.K_a: 'a', pygame.K_d: 'd', pygame.K_s: 's', 
@@ -103,20 +135,28 @@ class CooperativeTetris:
             pygame.K_i: 'i', pygame.K_u: 'u', pygame.K_o: 'o'
         }
         
-        for pygame_key, char in key_map.items():
-            keys_pressed[char] = keys[pygame_key]
-        
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYUP and self.track_posted_keys:
+                self.held_keys.discard(event.key)
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
+                if self.track_posted_keys and event.key in key_map:
+                    self.held_keys.add(event.key)
+                elif event.key == pygame.K_SPACE:
                     self.paused = not self.paused
+                    self.record_event('pause', paused=self.paused)
                 elif event.key == pygame.K_r and self.game_over:
                     self.restart_game()
                 elif event.key == pygame.K_TAB:
                     # Manual turn switch
-                    self.switch_turn()
+                    self.switch_turn('manual')
+        
+        # Read the keyboard after the event queue is pumped so it is current
+        keys = pygame.key.get_pressed()
+        
+        for pygame_key, char in key_map.items():
+            keys_pressed[char] = keys[pygame_key] or pygame_key in self.held_keys
         
         return keys_pressed
     
@@ -125,11 +165,11 @@ class CooperativeTetris:
         if self.paused or self.game_over:
             return
         
-        current_time = time.time() * 1000
+        current_time = self.current_time_ms()
         
         # Check for turn timeout
         if current_time - self.turn_switch_timer > self.turn_duration:
-            self.switch_turn()
+            self.switch_turn('timeout')
         
         # Handle current player input
         if self.current_player.current_piece:
@@ -144,8 +184,11 @@ class CooperativeTetris:
                 passed_piece = self.current_player.current_piece
                 if self.other_player.receive_piece(passed_piece):
                     self.current_player.current_piece = None
-                    self.switch_turn()
                     self.cooperation_bonus += 50
+                    self.record_event('pass_piece', player=self.current_player.id,
+                                      piece=passed_piece.type,
+                                      cooperation_bonus=self.cooperation_bonus)
+                    self.switch_turn('pass')
             
             # Handle hard drop
             if action == 'hard_drop':
@@ -173,10 +216,7 @@ class CooperativeTetris:
         if not self.current_player.current_piece:
             return
         
-        test_piece = self.current_player.current_piece.copy()
-        test_piece.move(0, 1)
-        
-        if self.board.is_valid_position(test_piece):
+        if self.board.can_place(self.current_player.current_piece, 0, 1):
             self.current_player.current_piece.move(0, 1)
         else:
             # Do not place immediately, let the lock timer handle it
@@ -202,6 +242,9 @@ class CooperativeTetris:
             self.cooperation_bonus = 0
         
         # Update scores
+        self.record_event('piece_placed', player=self.current_player.id,
+                          piece=self.current_player.current_piece.type,
+                          lines_cleared=lines_cleared, score=base_score)
         self.current_player.add_score(base_score)
         self.shared_score += base_score
         self.current_player.piece_placed()
@@ -209,62 +252,88 @@ class CooperativeTetris:
         # Check for game over
         if self.board.is_game_over():
             self.game_over = True
+            self.record_event('game_over', shared_score=self.shared_score,
+                              player1_score=self.player1.score,
+                              player2_score=self.player2.score)
+            if self.session_store:
+                try:
+                    self.session_store.record_session(self.shared_score, self.player1, self.player2)
+                except RuntimeError as e:
+                    # Keep playing without a leaderboard
+                    print(f"Session recording disabled: {e}")
+                    self.session_store = None
             return
         
         # Switch turns after placing a piece
         self.switch_turn()
         self.lock_timer = 0  # Reset lock timer
     
+    def set_cell_size(self, cell_size):
+        """Change the on-screen cell size and re-render the tile atlas
+        
+        The window is not resizable, so nothing in the game calls this yet;
+        it is the hook for a future scale setting. Only the cell tiles and
+        the board outline follow the new size; the board origin (BOARD_X,
+        BOARD_Y) and the UI layout stay fixed.
+        """
+        self.cell_size = cell_size
+        self.tiles.rebuild(cell_size)
+    
     def draw_board(self):
         """Draw the game board"""
+        cell_size = self.cell_size
+        
         # Draw board outline
         board_rect = pygame.Rect(BOARD_X - 2, BOARD_Y - 2, 
-                                BOARD_WIDTH * CELL_SIZE + 4, 
-                                BOARD_HEIGHT * CELL_SIZE + 4)
+                                BOARD_WIDTH * cell_size + 4, 
+                                BOARD_HEIGHT * cell_size + 4)
         pygame.draw.rect(self.screen, WHITE, board_rect, 2)
         
-        # Draw grid
+        # Queue grid cells; the batch is blitted in draw_tiles
+        self.tile_batch.clear()
         for y in range(BOARD_HEIGHT):
+            row = self.board.grid[y]
             for x in range(BOARD_WIDTH):
-                cell_rect = pygame.Rect(BOARD_X + x * CELL_SIZE, 
-                                      BOARD_Y + y * CELL_SIZE, 
-                                      CELL_SIZE, CELL_SIZE)
-                
-                # Draw cell
-                pygame.draw.rect(self.screen, self.board.grid[y][x], cell_rect)
-                pygame.draw.rect(self.screen, GRAY, cell_rect, 1)
+                self.tile_batch.add(self.tiles.cell_area(row[x]),
+                                    BOARD_X + x * cell_size,
+                                    BOARD_Y + y * cell_size)
     
     def draw_piece(self, piece, offset_x=0, offset_y=0):
         """Draw a tetris piece"""
         if not piece:
             return
         
-        cells = piece.get_cells()
-        for x, y in cells:
+        cell_size = self.cell_size
+        area = self.tiles.piece_area(piece.color)
+        for col, row in piece.cell_offsets():
+            x = piece.x + col
+            y = piece.y + row
             if y >= 0:  # Only draw visible cells
-                cell_rect = pygame.Rect(BOARD_X + (x + offset_x) * CELL_SIZE, 
-                                      BOARD_Y + (y + offset_y) * CELL_SIZE, 
-                                      CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(self.screen, piece.color, cell_rect)
-                pygame.draw.rect(self.screen, WHITE, cell_rect, 2)
+                self.tile_batch.add(area,
+                                    BOARD_X + (x + offset_x) * cell_size,
+                                    BOARD_Y + (y + offset_y) * cell_size)
     
     def draw_ghost_piece(self):
         """Draw ghost piece showing where current piece will land"""
         if not self.current_player.current_piece:
             return
         
-        drop_y = self.board.get_drop_position(self.current_player.current_piece)
-        ghost_piece = self.current_player.current_piece.copy()
-        ghost_piece.y = drop_y
+        piece = self.current_player.current_piece
+        drop_y = self.board.get_drop_position(piece)
         
-        # Draw ghost piece with transparency effect
-        cells = ghost_piece.get_cells()
-        for x, y in cells:
+        # Outline-only tile lets the board show through
+        cell_size = self.cell_size
+        for col, row in piece.cell_offsets():
+            x = piece.x + col
+            y = drop_y + row
             if y >= 0:
-                cell_rect = pygame.Rect(BOARD_X + x * CELL_SIZE, 
-                                      BOARD_Y + y * CELL_SIZE, 
-                                      CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(self.screen, LIGHT_GRAY, cell_rect, 2)
+                self.tile_batch.add(self.tiles.ghost_area,
+                                    BOARD_X + x * cell_size,
+                                    BOARD_Y + y * cell_size)
+    
+    def draw_tiles(self):
+        """Blit all queued board, ghost and piece tiles in one call"""
+        self.tile_batch.draw(self.screen)
     
     def draw_ui(self):
         """Draw user interface elements"""
@@ -289,7 +358,7 @@ class CooperativeTetris:
         self.screen.blit(current_text, (PLAYER_INDICATOR_X, PLAYER_INDICATOR_Y))
         
         # Turn timer
-        current_time = time.time() * 1000
+        current_time = self.current_time_ms()
         time_left = max(0, self.turn_duration - (current_time - self.turn_switch_timer)) / 1000
         timer_text = self.small_font.render(f"Time left: {time_left:.1f}s", True, WHITE)
         self.screen.blit(timer_text, (PLAYER_INDICATOR_X, PLAYER_INDICATOR_Y + 30))
@@ -334,6 +403,16 @@ class CooperativeTetris:
             self.screen.blit(game_over_text, (SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 - 50))
             self.screen.blit(final_score_text, (SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2))
             self.screen.blit(restart_text, (SCREEN_WIDTH//2 - 80, SCREEN_HEIGHT//2 + 50))
+            
+            # Leaderboard from the store's cache, never queried per frame
+            if self.session_store:
+                top_scores = self.session_store.top_scores()
+                for i, score in enumerate(top_scores):
+                    top_text = self.small_font.render(f"{i + 1}. {score}", True, YELLOW)
+                    self.screen.blit(top_text, (SCREEN_WIDTH//2 - 40, SCREEN_HEIGHT//2 + 110 + i * 20))
+                if top_scores:
+                    header_text = self.small_font.render("Top Scores", True, YELLOW)
+                    self.screen.blit(header_text, (SCREEN_WIDTH//2 - 50, SCREEN_HEIGHT//2 + 85))
         
         # Pause screen
         if self.paused and not self.game_over:
@@ -348,6 +427,15 @@ class CooperativeTetris:
             self.screen.blit(pause_text, (SCREEN_WIDTH//2 - 60, SCREEN_HEIGHT//2 - 20))
             self.screen.blit(continue_text, (SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 20))
     
+    def draw_frame(self):
+        """Render the complete frame to the screen surface"""
+        self.screen.fill(BLACK)
+        self.draw_board()
+        self.draw_ghost_piece()
+        self.draw_piece(self.current_player.current_piece)
+        self.draw_tiles()
+        self.draw_ui()
+    
     def restart_game(self):
         """Restart the game"""
         self.board = GameBoard()
@@ -361,9 +449,14 @@ class CooperativeTetris:
         self.game_over = False
         self.paused = False
         
-        self.player1.spawn_new_piece()
-        self.player2.spawn_new_piece()
-        self.switch_turn()
+        # Each game is its own telemetry session
+        self.telemetry.new_session()
+        self.games_started += 1
+        self.record_event('session_start', game=self.games_started)
+        
+        self.spawn_piece(self.player1)
+        self.spawn_piece(self.player2)
+        self.switch_turn('start')
         self.lock_timer = 0
     
     def run(self):
@@ -376,13 +469,12 @@ class CooperativeTetris:
             self.update_game_logic(keys_pressed)
             
             # Draw everything
-            self.screen.fill(BLACK)
-            self.draw_board()
-            self.draw_ghost_piece()
-            self.draw_piece(self.current_player.current_piece)
-            self.draw_ui()
+            self.draw_frame()
             
             pygame.display.flip()
-            self.clock.tick(60)  # 60 FPS
+            self.clock.tick(self.fps)
         
+        self.telemetry.close()
+        if self.session_store:
+            self.session_store.close()
         pygame.quit()
@@ -4,6 +4,13 @@ Tetris piece definitions and logic
 import random
 from constants import PIECE_COLORS
 
+def _shape_cells(shape):
+    """Get the (col, row) offsets of the occupied cells in a shape"""
+    return tuple((col_idx, row_idx)
+                 for row_idx, row in enumerate(shape)
+                 for col_idx, cell in enumerate(row)
+                 if cell != '.' and cell != ' ')
+
 class TetrisPiece:
     """Represents a Tetris piece with its shape, position, and rotation"""
     
@@ -53,6 +60,12 @@ class TetrisPiece:
         ]
     }
     
+    # Occupied cell offsets per piece type and rotation, computed once
+    CELLS = {
+        piece_type: tuple(_shape_cells(shape) for shape in rotations)
+        for piece_type, rotations in SHAPES.items()
+    }
+    
     def __init__(self, piece_type=None, x=4, y=0):
         """Initialize a new piece"""
         if piece_type is None:
@@ -69,15 +82,15 @@ class TetrisPiece:
         """Get the current shape based on rotation"""
         return self.SHAPES[self.type][self.rotation]
     
+    def cell_offsets(self, rotation=None):
+        """Get the (col, row) offsets of the occupied cells, without allocating"""
+        if rotation is None:
+            rotation = self.rotation
+        return self.CELLS[self.type][rotation]
+    
     def get_cells(self):
         """Get all occupied cells of the piece"""
-        cells = []
-        shape = self.get_shape()
-        for row_idx, row in enumerate(shape):
-            for col_idx, cell in enumerate(row):
-                if cell != '.' and cell != ' ':
-                    cells.append((self.x + col_idx, self.y + row_idx))
-        return cells
+        return [(self.x + col, self.y + row) for col, row in self.cell_offsets()]
     
     def move(self, dx, dy):
         """Move the piece by the given offset"""
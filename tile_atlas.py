@@ -0,0 +1,93 @@
+"""
+Pre-rendered tile atlas and batched tile drawing for cooperative Tetris
+"""
+import pygame
+from constants import CELL_SIZE, PIECE_COLORS, BLACK, WHITE, GRAY, LIGHT_GRAY
+
+# Color used for the transparent interior of the ghost tile; never a piece color
+TRANSPARENT_KEY = (255, 0, 255)
+
+
+class TileAtlas:
+    """Renders every cell variant once into a single surface"""
+
+    def __init__(self, cell_size=CELL_SIZE):
+        """Build the atlas for the given cell size"""
+        self.surface = None
+        self.cell_size = 0
+        self.cell_areas = {}
+        self.piece_areas = {}
+        self.ghost_area = None
+        self.rebuild(cell_size)
+
+    def rebuild(self, cell_size):
+        """Re-render all tiles at a new cell size"""
+        colors = [BLACK] + list(PIECE_COLORS.values())
+        # One column per board cell color, one per piece color, one for the ghost
+        tile_count = len(colors) + len(PIECE_COLORS) + 1
+
+        self.cell_size = cell_size
+        self.surface = pygame.Surface((tile_count * cell_size, cell_size))
+        self.surface.set_colorkey(TRANSPARENT_KEY)
+        self.cell_areas = {}
+        self.piece_areas = {}
+
+        column = 0
+        # Board cells: color fill with a thin grid line
+        for color in colors:
+            self.cell_areas[color] = self._render_tile(column, color, GRAY, 1)
+            column += 1
+
+        # Falling piece cells: color fill with a bright border
+        for color in PIECE_COLORS.values():
+            self.piece_areas[color] = self._render_tile(column, color, WHITE, 2)
+            column += 1
+
+        # Ghost cell: outline only, interior shows the board underneath
+        self.ghost_area = self._render_tile(column, TRANSPARENT_KEY, LIGHT_GRAY, 2)
+
+    def _render_tile(self, column, fill_color, border_color, border_width):
+        """Render one tile into the atlas and return its source area"""
+        area = pygame.Rect(column * self.cell_size, 0, self.cell_size, self.cell_size)
+        pygame.draw.rect(self.surface, fill_color, area)
+        pygame.draw.rect(self.surface, border_color, area, border_width)
+        return area
+
+    def cell_area(self, color):
+        """Get the atlas area of a board cell with the given color"""
+        return self.cell_areas[color]
+
+    def piece_area(self, color):
+        """Get the atlas area of a falling piece cell with the given color"""
+        return self.piece_areas[color]
+
+
+class TileBatch:
+    """Reusable sequence of (atlas, position, area) entries drawn with one blit call"""
+
+    def __init__(self, atlas, capacity):
+        """Preallocate entries for up to capacity tiles"""
+        self.atlas = atlas
+        self._entries = [[atlas.surface, [0, 0], atlas.ghost_area] for _ in range(capacity)]
+        self._active = []
+
+    def clear(self):
+        """Forget all queued tiles, keeping the entries for reuse"""
+        self._active.clear()
+
+    def add(self, area, screen_x, screen_y):
+        """Queue one atlas tile at a screen position"""
+        index = len(self._active)
+        if index == len(self._entries):
+            self._entries.append([self.atlas.surface, [0, 0], area])
+        entry = self._entries[index]
+        entry[0] = self.atlas.surface
+        entry[1][0] = screen_x
+        entry[1][1] = screen_y
+        entry[2] = area
+        self._active.append(entry)
+
+    def draw(self, surface):
+        """Blit every queued tile in a single call"""
+        if self._active:
+            surface.blits(self._active, doreturn=False)